@@ -0,0 +1,94 @@
+"""msgspec mirrors of MainConfig and RLCTConfig for fast decoding of YAML configs.
+
+Field names mirror config_setup.py, but the structs only check types on decode: they carry no defaults of their own.
+Keys missing from the YAML stay UNSET and are dropped by to_builtins, so MainConfig applies its own defaults and
+sets derived fields (run_name, vocab sizes, num_samples, ...) in _set_fields. MainConfig remains the public entry point.
+"""
+from typing import Any, Optional, Union
+from pathlib import Path
+import msgspec
+from msgspec import UNSET, UnsetType
+
+from di_automata.config_setup import (
+    MainConfig,
+    ModelType,
+    ParameterisationType,
+    RLCTLossType,
+    RLCTSamplerType,
+)
+
+
+class SGLDKwargsStruct(msgspec.Struct, kw_only=True):
+    lr: float
+    noise_level: Union[float, UnsetType] = UNSET
+    weight_decay: Union[float, UnsetType] = UNSET
+    elasticity: Union[float, UnsetType] = UNSET
+    bounding_box_size: Union[Optional[float], UnsetType] = UNSET
+    temperature: Union[str, UnsetType] = UNSET
+    num_samples: Union[Optional[int], UnsetType] = UNSET
+    mh_frequency: Union[int, UnsetType] = UNSET
+
+
+class EssentialDynamicsStruct(msgspec.Struct, kw_only=True):
+    batches_per_checkpoint: Union[int, UnsetType] = UNSET
+    eval_frequency: Union[int, UnsetType] = UNSET
+
+
+class RLCTConfigStruct(msgspec.Struct, kw_only=True):
+    rlct_loss_type: RLCTLossType
+    sampling_method: Union[Optional[RLCTSamplerType], UnsetType] = UNSET
+    num_chains: Union[int, UnsetType] = UNSET
+    num_draws: Union[int, UnsetType] = UNSET
+    num_samples: Union[Optional[int], UnsetType] = UNSET
+    num_burnin_steps: Union[int, UnsetType] = UNSET
+    num_steps_bw_draws: Union[int, UnsetType] = UNSET
+    cores: Union[int, UnsetType] = UNSET
+    seed: Union[Optional[Union[int, list[Optional[int]]]], UnsetType] = UNSET
+    verbose: Union[Optional[bool], UnsetType] = UNSET
+    online: Union[bool, UnsetType] = UNSET
+    use_distill_loss: Union[bool, UnsetType] = UNSET
+    use_diagnostics: Union[bool, UnsetType] = UNSET
+    sgld_kwargs: Union[Optional[SGLDKwargsStruct], UnsetType] = UNSET
+    ed_config: Union[Optional[EssentialDynamicsStruct], UnsetType] = UNSET
+    rlct_model_save_dir: Union[Optional[str], UnsetType] = UNSET
+    rlct_data_dir: Union[Optional[str], UnsetType] = UNSET
+
+
+class MainConfigStruct(msgspec.Struct, kw_only=True):
+    model_type: ModelType
+    task_config: dict[str, Any]
+    rlct_config: Union[Optional[RLCTConfigStruct], UnsetType] = UNSET
+    # Sub-configs which are not rebuilt in hot paths are left as plain dicts and validated by MainConfig
+    wandb_config: Union[dict[str, Any], UnsetType] = UNSET
+    dataloader_config: Union[dict[str, Any], UnsetType] = UNSET
+    initialisation: Union[dict[str, Any], UnsetType] = UNSET
+    optimizer_config: Union[dict[str, Any], UnsetType] = UNSET
+    model_save_method: Union[str, UnsetType] = UNSET
+    aws_bucket: Union[str, UnsetType] = UNSET
+    nano_gpt_config: Union[Optional[dict[str, Any]], UnsetType] = UNSET
+    tflens_config: Union[Optional[dict[str, Any]], UnsetType] = UNSET
+    llc_train: Union[bool, UnsetType] = UNSET
+    ed_train: Union[bool, UnsetType] = UNSET
+    use_ema: Union[bool, UnsetType] = UNSET
+    use_scratchpad: Union[bool, UnsetType] = UNSET
+    num_model_save_workers: Union[Optional[int], UnsetType] = UNSET
+    ema_decay: Union[float, UnsetType] = UNSET
+    parameterisation: Union[ParameterisationType, UnsetType] = UNSET
+    num_training_iter: Union[int, UnsetType] = UNSET
+    num_eval_batches: Union[Optional[int], UnsetType] = UNSET
+    early_stop_patience: Union[Optional[int], UnsetType] = UNSET
+    early_stop_acc_threshold: Union[Optional[float], UnsetType] = UNSET
+    run_name: Union[Optional[str], UnsetType] = UNSET
+    is_wandb_enabled: Union[Optional[bool], UnsetType] = UNSET
+    num_epochs: Union[Optional[int], UnsetType] = UNSET
+    eval_frequency: Union[Optional[int], UnsetType] = UNSET
+
+
+def load_main_config_struct(path: Union[str, Path]) -> MainConfigStruct:
+    """Decode a YAML file straight into a MainConfigStruct, without building an intermediate dict. Unknown keys are ignored."""
+    return msgspec.yaml.decode(Path(path).read_bytes(), type=MainConfigStruct, strict=False)
+
+
+def to_main_config(struct: MainConfigStruct) -> MainConfig:
+    """Build the public Pydantic MainConfig (applying its defaults and setting derived fields) from a decoded struct."""
+    return MainConfig(**msgspec.to_builtins(struct))
@@ -0,0 +1,89 @@
+"""Rarely used task configs, split out of config_setup so their Pydantic schemas are only built on first access.
+
+Import these by name from di_automata.config_setup (e.g. `from di_automata.config_setup import DihedralAutomatonConfig`);
+its module-level __getattr__ loads this module on demand. `from di_automata.config_setup import *` does not include them.
+"""
+from pydantic import Field, ValidationInfo, field_validator
+from functools import cached_property
+from typing import Any, Callable, ClassVar, Optional
+
+from di_automata.config_setup import AutomatonLabel, DatasetConfig, _fact
+
+
+class DihedralAutomatonConfig(DatasetConfig):
+    n: Optional[int] = Field(default=4, description="Size of the 'cycle'. There are 2n states considering also the toggle bit.")
+    label_type: Optional[AutomatonLabel] = Field(default=AutomatonLabel.STATE, description="'state': the state id, i.e. considering both toggle and position. \n" \
+            + "    - 'toggle': the toggle bit (in {0, 1}). \n" \
+            + "    - 'position': the position on the n-cycle (in [n]).")
+    
+    _OUTPUT_VOCAB: ClassVar[dict[AutomatonLabel, Callable[["DihedralAutomatonConfig"], int]]] = {
+        AutomatonLabel.STATE: lambda s: s.n * 2, # Toggle 0,1 and state
+        AutomatonLabel.TOGGLE: lambda s: 2, # Toggle bit in {0, 1}
+        AutomatonLabel.POSITION: lambda s: s.n, # Position on the n-cycle in [1,...n]
+    }
+
+    @cached_property
+    def vocab_size(self):
+        return 2
+    
+    @cached_property
+    def output_vocab_size(self):
+        return self._OUTPUT_VOCAB[self.label_type](self)
+    
+
+class QuaternionAutomatonConfig(DatasetConfig):
+    """This class is a simple creature."""
+    @property
+    def vocab_size(self):
+        return 4
+
+    @property
+    def output_vocab_size(self):
+        return 8
+    
+
+class PermutationResetAutomatonConfig(DatasetConfig):
+    """Input to automaton is an action, which can either be application of a generator or a reset to a particular state. 
+    
+    Generators modify the current state based on the permutation they represent.
+    Reset action directly sets the current state to a specific permutation.
+    """
+    n: int = Field(default=4, description="Should take values 4 or 5.")
+    generators: Any = Field(default=[[1,0,2,3,4], [4,0,1,2,3]], validate_default=True, description="List of generators for permutation group.")
+    perm_probs: Optional[list[float]] = Field(default=None, validate_default=True, description="Probability of any of the generator lists from generators. If not specified, return uniform distribution via validator method.")
+    
+    @field_validator("generators", mode="before")
+    @classmethod
+    def check_generators(cls, v, info: ValidationInfo):
+        n = info.data.get("n")
+        assert len(v[0]) == n, "Generators must be of length n."
+        return v
+        
+    @field_validator("perm_probs", mode="before")
+    @classmethod
+    def set_perm_probs(cls, v, info: ValidationInfo):
+        """
+        Args:
+            v: perm_probs value.
+            info: validation info, with previously validated class attribute values in info.data.
+        """
+        if v is None:
+            n_generators = len(info.data.get("generators", []))
+            return [1.0 / n_generators] * n_generators if n_generators else []
+        return v
+
+    @cached_property
+    def vocab_size(self):
+        """There is one reset action for each possible state. 
+        The number of possible states is n! since there are n! possible permutations of n elements.
+        
+        Total input vocabulary size (number of unique actions the automaton can take) is sum of number of generators and number of reset actions.
+        """
+        return _fact(self.n) + len(self.generators)
+
+    @cached_property
+    def output_vocab_size(self):
+        """The output of the automaton is the state after an action is applied. 
+        State is represented by a permutation of n elements.
+        """
+        return _fact(self.n)
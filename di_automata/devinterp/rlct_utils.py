@@ -1,12 +1,11 @@
-from typing import Callable
-import pandas as pd
+from typing import Callable, Optional
+from functools import lru_cache
+from dataclasses import dataclass, fields
+from concurrent.futures import Future, ThreadPoolExecutor
+import atexit
 import numpy as np
-from plotnine import *
-from matplotlib import pyplot as plt
-import plotly.graph_objects as go
 import wandb
 import os
-from plotly.subplots import make_subplots
 
 
 from di_automata.config_setup import MainConfig
@@ -19,75 +18,107 @@ from di_automata.devinterp.slt.loss import OnlineLossStatistics
 from di_automata.devinterp.slt.callback import validate_callbacks
 
 
-def plot_pca_plotly(
-    component_0: list[float], 
-    component_1: list[float], 
-    component_2: list[float], 
+# Single background writer for PNG exports, so encoding and disk IO overlap with the caller's next steps
+_IO_POOL = ThreadPoolExecutor(max_workers=1)
+atexit.register(_IO_POOL.shutdown, wait=True)
+
+# Bar positions / ticks for the top 3 principal components in plot_explained_var
+_PC_IDX = np.array([1, 2, 3])
+
+
+def _pca_long(
+    component_0: np.ndarray,
+    component_1: np.ndarray,
+    component_2: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Long-form layout of the three component pairs (0 vs 1, 0 vs 2, 1 vs 2) as typed arrays.
+
+    Returns (x, y, comparison, checkpoint_idx), each of length 3n and laid out in contiguous blocks of n per pair,
+    so per-pair views can be taken with np.split without copying.
+    """
+    n = len(component_0)
+    x = np.concatenate([component_0, component_0, component_1])
+    y = np.concatenate([component_1, component_2, component_2])
+    comparison = np.repeat(np.arange(3, dtype=np.int8), n)
+    # Smallest unsigned dtype (uint16 for < 65k checkpoints) for the colour index
+    checkpoint_idx = np.tile(np.arange(n, dtype=np.min_scalar_type(max(n - 1, 0))), 3)
+    return x, y, comparison, checkpoint_idx
+
+
+def plot_pca(
+    component_0: np.ndarray, 
+    component_1: np.ndarray, 
+    component_2: np.ndarray, 
     config: MainConfig,
-):
-    fig = make_subplots(rows=1, cols=3, subplot_titles=("Component 0 vs. 1", "Component 0 vs. 2", "Component 1 vs. 2"))
-
-    color_scale = 'sunset'
-    checkpoint_idx = list(range(len(component_0)))
-    
-    fig.add_trace(go.Scatter(x=component_0, y=component_1, mode='markers', 
-                             marker=dict(color=checkpoint_idx, colorscale=color_scale, colorbar=dict(title="Checkpoint Index"), showscale=True),
-                             showlegend=False), 
-                  row=1, col=1)
-    fig.add_trace(go.Scatter(x=component_0, y=component_2, mode='markers', 
-                             marker=dict(color=checkpoint_idx, colorscale=color_scale, showscale=False),
-                             showlegend=False), 
-                  row=1, col=2)
-    fig.add_trace(go.Scatter(x=component_1, y=component_2, mode='markers', 
-                             marker=dict(color=checkpoint_idx, colorscale=color_scale, showscale=False),
-                             showlegend=False), 
-                  row=1, col=3)
-
-    fig.update_xaxes(title_text="Component 1", row=1, col=1)
-    fig.update_yaxes(title_text="Component 2", row=1, col=1)
-    
-    fig.update_xaxes(title_text="Component 1", row=1, col=2)
-    fig.update_yaxes(title_text="Component 3", row=1, col=2)
-
-    fig.update_xaxes(title_text="Component 2", row=1, col=3)
-    fig.update_yaxes(title_text="Component 3", row=1, col=3)
-
-    fig.update_layout(
-        title_text=f"Essential Dynamics PCA {config.task_config.dataset_type} seqlen {config.task_config.length} its {config.num_training_iter} cpfreq {config.rlct_config.ed_config.eval_frequency}", 
-        height=500, width=1500,
-    )
+) -> Future:
+    """Scatter the three pairs of top PCA components, coloured by checkpoint index, and save to PCA.png.
+    
+    Components should be 1D float32 arrays of length n_checkpoints; anything else is converted once here.
+    The PNG is written on a background thread: call .result() on the returned future before reading PCA.png.
+    """
+    from matplotlib.figure import Figure
 
-    fig.write_image("PCA.png")
+    component_0 = np.ascontiguousarray(component_0, dtype=np.float32)
+    component_1 = np.ascontiguousarray(component_1, dtype=np.float32)
+    component_2 = np.ascontiguousarray(component_2, dtype=np.float32)
+    x, y, _, checkpoint_idx = _pca_long(component_0, component_1, component_2)
+    titles = ["Component 0 vs. 1", "Component 0 vs. 2", "Component 1 vs. 2"]
+    labels = [("Component 1", "Component 2"), ("Component 1", "Component 3"), ("Component 2", "Component 3")]
+
+    # Standalone Figure rather than pyplot, which is not thread-safe and would keep the figure registered
+    fig = Figure(figsize=(15, 5))
+    axes = fig.subplots(1, 3)
+    blocks = zip(np.split(x, 3), np.split(y, 3), np.split(checkpoint_idx, 3))
+    for ax, (x_i, y_i, idx_i), title, (xlabel, ylabel) in zip(axes, blocks, titles, labels):
+        sc = ax.scatter(x_i, y_i, c=idx_i, cmap='plasma', s=8)
+        ax.set(title=title, xlabel=xlabel, ylabel=ylabel)
+    fig.colorbar(sc, ax=axes[-1], label="Checkpoint Index")
+    fig.suptitle(f"Essential Dynamics PCA {config.task_config.dataset_type} seqlen {config.task_config.length} its {config.num_training_iter} cpfreq {config.rlct_config.ed_config.eval_frequency}")
+    return _IO_POOL.submit(fig.savefig, "PCA.png", dpi=150)
     
     
 def plot_explained_var(explained_var: np.ndarray):
-    plt.figure(figsize=(10, 7))
-    plt.bar(range(1, 4), explained_var, alpha=0.5, align='center', label='individual explained variance')
-    plt.ylabel('Explained variance ratio')
-    plt.xlabel('Principal components')
-    plt.xticks([1, 2, 3])
-    plt.title('Explained variance by top 3 PCA components')
-    plt.legend(loc='best')
-    plt.savefig("pca_explained_var.png", dpi=300)
+    from matplotlib import pyplot as plt
+
+    fig, ax = plt.subplots(figsize=(10, 7))
+    ax.bar(_PC_IDX, explained_var, alpha=0.5, align='center', label='individual explained variance')
+    ax.set_ylabel('Explained variance ratio')
+    ax.set_xlabel('Principal components')
+    ax.set_xticks(_PC_IDX)
+    ax.set_title('Explained variance by top 3 PCA components')
+    ax.legend(loc='best')
+    fig.savefig("pca_explained_var.png", dpi=300)
+    plt.close(fig)
     
 
 def plot_trace(trace: np.ndarray, name: str):
-    """Plot a diagnostic trace used to examine chain health."""
-    df = pd.DataFrame(trace).reset_index().melt(id_vars="index", var_name="timestep", value_name=name)
-    df['timestep'] = df['timestep'].astype(int)
+    """Plot a diagnostic trace used to examine chain health, one line per chain.
     
-    p = (
-        ggplot(df, aes(x='timestep', y=name, color='factor(index)')) +
-        geom_line()
-    )
-    return p
+    Returns a standalone Figure (not registered with pyplot), so it is freed once the caller has saved it.
+    """
+    from matplotlib.figure import Figure
 
+    fig = Figure(figsize=(10, 4))
+    ax = fig.add_subplot()
+    for chain, chain_trace in enumerate(trace):
+        ax.plot(chain_trace, label=str(chain), linewidth=0.5)
+    ax.set_xlabel('timestep')
+    ax.set_ylabel(name)
+    ax.legend(title='chain', loc='center left', bbox_to_anchor=(1, 0.5))
+    return fig
 
-def create_callbacks(config: MainConfig, device: str) -> tuple[list[Callable], list[str]]:
-    rlct_config = config.rlct_config
-    num_chains, num_draws, num_samples = rlct_config.num_chains, rlct_config.num_draws, rlct_config.num_samples
-    
-    llc_estimator = OnlineLLCEstimator(num_chains, num_draws, num_samples, device) if rlct_config.online else LLCEstimator(num_chains, num_draws, num_samples, device)
+
+@lru_cache(maxsize=4)
+def _build_callbacks(
+    num_chains: int,
+    num_draws: int,
+    num_samples: int,
+    device: str,
+    online: bool,
+    use_diagnostics: bool,
+) -> tuple[Callable, ...]:
+    """Allocate and validate callbacks once per sampling setup. Callers must reset() them before reuse."""
+    llc_estimator = OnlineLLCEstimator(num_chains, num_draws, num_samples, device) if online else LLCEstimator(num_chains, num_draws, num_samples, device)
 
     callbacks = [
         OnlineWBICEstimator(num_chains, num_draws, num_samples, device),
@@ -95,13 +126,68 @@ def create_callbacks(config: MainConfig, device: str) -> tuple[list[Callable], l
         NoiseNorm(num_chains, num_draws, device, p_norm=2),
         GradientNorm(num_chains, num_draws, device, p_norm=2),
         # GradientDistribution(num_chains, num_draws, device=device),
-    ] if rlct_config.use_diagnostics else []
-    callbacks = [llc_estimator, *callbacks]
+    ] if use_diagnostics else []
+    callbacks = (llc_estimator, *callbacks)
     validate_callbacks(callbacks)
+    return callbacks
+
+
+@dataclass(slots=True, frozen=True)
+class CallbackResults:
+    """Per-(chain, draw) traces from a sampling run, each a contiguous float32 array of shape (num_chains, num_draws).
+    
+    Traces whose callback was not run are None. Callback sample() already returns fresh CPU copies (see SamplerCallback),
+    so the arrays are only converted, not copied again, and results across checkpoints can be kept and stacked field-wise
+    with np.stack.
+    """
+    loss: Optional[np.ndarray] = None
+    llc: Optional[np.ndarray] = None
+    wbic: Optional[np.ndarray] = None
+    weight_norm: Optional[np.ndarray] = None
+    gradient_norm: Optional[np.ndarray] = None
+    noise_norm: Optional[np.ndarray] = None
+
+    @classmethod
+    def from_sample(cls, results: dict) -> "CallbackResults":
+        """Collect the '<name>/trace' entries of the dict returned by estimate_learning_coeff_with_summary."""
+        traces = {}
+        for f in fields(cls):
+            trace = results.get(f"{f.name}/trace")
+            traces[f.name] = None if trace is None else np.asarray(trace, dtype=np.float32, order="C")
+        return cls(**traces)
+
+    def to_dataframe(self):
+        """Long-form frame with one row per (chain, draw) and one column per available trace."""
+        import pandas as pd
+
+        traces = {f.name: getattr(self, f.name) for f in fields(self) if getattr(self, f.name) is not None}
+        if not traces:
+            raise ValueError("CallbackResults has no traces to convert.")
+        num_chains, num_draws = next(iter(traces.values())).shape
+        columns = {
+            "chain": np.repeat(np.arange(num_chains, dtype=np.int32), num_draws),
+            "draw": np.tile(np.arange(num_draws, dtype=np.int32), num_chains),
+        }
+        for name, trace in traces.items():
+            columns[name] = trace.ravel()
+        return pd.DataFrame(columns, copy=False)
+
+
+def create_callbacks(config: MainConfig, device: str) -> tuple[list[Callable], list[str]]:
+    rlct_config = config.rlct_config
+    cached = _build_callbacks(
+        rlct_config.num_chains,
+        rlct_config.num_draws,
+        rlct_config.num_samples,
+        device,
+        rlct_config.online,
+        rlct_config.use_diagnostics,
+    )
+    for callback in cached:
+        callback.reset()
+    callbacks = list(cached)
     
-    callback_names = []
-    for callback in callbacks:
-        callback_names.append(type(callback).__name__)
+    callback_names = [type(callback).__name__ for callback in callbacks]
     
     return callbacks, callback_names
 
@@ -119,6 +205,7 @@ def extract_and_save_rlct_data(
     """
     log_dict = {}
     return_dict = {}
+    traces = CallbackResults.from_sample(data)
     # Always log mean and std
     log_dict[f"{sampler_type}/mean"] = return_dict[f"{sampler_type}/mean"] = data["llc/mean"]
     log_dict[f"{sampler_type}/std"] = return_dict[f"{sampler_type}/std"] = data["llc/std"]
@@ -130,9 +217,9 @@ def extract_and_save_rlct_data(
         log_dict[f"{sampler_type}/accept_ratio"] = data["accept_ratio/mean"]
         return_dict[f"{sampler_type}/accept_ratio"] = data["accept_ratio/mean"]
     
-    loss_p = plot_trace(data["loss/trace"], "loss")
+    loss_p = plot_trace(traces.loss, "loss")
     loss_filename = f"{sampler_type}_loss.png"
-    loss_p.save(loss_filename, width=10, height=4, dpi=300)
+    loss_p.savefig(loss_filename, dpi=300, bbox_inches='tight')
     log_dict[f"{sampler_type}/loss"] = wandb.Image(loss_filename)
     
     weight_norm_filename = "weight_norm.png"
@@ -146,21 +233,21 @@ def extract_and_save_rlct_data(
         return_dict[f"{sampler_type}/wbic/std/mean"] = data["wbic/stds"].mean().item()
 
     if 'WeightNorm' in callback_names:
-        weight_norm_p = plot_trace(data["weight_norm/trace"], "weight norm")
-        return_dict[f"{sampler_type}/weight_norm/mean"] = data["weight_norm/trace"].mean().item()
-        weight_norm_p.save(weight_norm_filename, width=10, height=4, dpi=300)
+        weight_norm_p = plot_trace(traces.weight_norm, "weight norm")
+        return_dict[f"{sampler_type}/weight_norm/mean"] = traces.weight_norm.mean().item()
+        weight_norm_p.savefig(weight_norm_filename, dpi=300, bbox_inches='tight')
         log_dict["weight_norm"] = wandb.Image(weight_norm_filename)
     
     if 'NoiseNorm' in callback_names:
-        noise_norm_p = plot_trace(data["noise_norm/trace"], "noise norm")
-        return_dict[f"{sampler_type}/noise_norm/mean"] = data["noise_norm/trace"].mean().item()
-        noise_norm_p.save(noise_norm_filename, width=10, height=4, dpi=300)
+        noise_norm_p = plot_trace(traces.noise_norm, "noise norm")
+        return_dict[f"{sampler_type}/noise_norm/mean"] = traces.noise_norm.mean().item()
+        noise_norm_p.savefig(noise_norm_filename, dpi=300, bbox_inches='tight')
         log_dict["noise_norm"] = wandb.Image(noise_norm_filename)
     
     if 'GradientNorm' in callback_names:
-        gradient_norm_p = plot_trace(data["gradient_norm/trace"], "gradient norm")
-        return_dict[f"{sampler_type}/gradient_norm/mean"] = data["gradient_norm/trace"].mean().item()
-        gradient_norm_p.save(gradient_norm_filename, width=10, height=4, dpi=300)
+        gradient_norm_p = plot_trace(traces.gradient_norm, "gradient norm")
+        return_dict[f"{sampler_type}/gradient_norm/mean"] = traces.gradient_norm.mean().item()
+        gradient_norm_p.savefig(gradient_norm_filename, dpi=300, bbox_inches='tight')
         log_dict["gradient_norm"] = wandb.Image(gradient_norm_filename)
     
     # TODO: additional metrics to be logged (e.g., GradientDistribution)
@@ -187,6 +274,7 @@ def extract_and_save_rlct_data(
     """
     log_dict = {}
     return_dict = {}
+    traces = CallbackResults.from_sample(data)
     # Always log mean and std
     log_dict[f"{sampler_type}/mean"] = return_dict[f"{sampler_type}/mean"] = data["llc/mean"]
     log_dict[f"{sampler_type}/std"] = return_dict[f"{sampler_type}/std"] = data["llc/std"]
@@ -198,9 +286,9 @@ def extract_and_save_rlct_data(
         log_dict[f"{sampler_type}/accept_ratio"] = data["accept_ratio/mean"]
         return_dict[f"{sampler_type}/accept_ratio"] = data["accept_ratio/mean"]
     
-    loss_p = plot_trace(data["loss/trace"], "loss")
+    loss_p = plot_trace(traces.loss, "loss")
     loss_filename = f"{sampler_type}_loss.png"
-    loss_p.save(loss_filename, width=10, height=4, dpi=300)
+    loss_p.savefig(loss_filename, dpi=300, bbox_inches='tight')
     log_dict[f"{sampler_type}/loss"] = wandb.Image(loss_filename)
     
     weight_norm_filename = "weight_norm.png"
@@ -214,21 +302,21 @@ def extract_and_save_rlct_data(
         return_dict[f"{sampler_type}/wbic/std/mean"] = data["wbic/stds"].mean().item()
 
     if 'WeightNorm' in callback_names:
-        weight_norm_p = plot_trace(data["weight_norm/trace"], "weight norm")
-        return_dict[f"{sampler_type}/weight_norm/mean"] = data["weight_norm/trace"].mean().item()
-        weight_norm_p.save(weight_norm_filename, width=10, height=4, dpi=300)
+        weight_norm_p = plot_trace(traces.weight_norm, "weight norm")
+        return_dict[f"{sampler_type}/weight_norm/mean"] = traces.weight_norm.mean().item()
+        weight_norm_p.savefig(weight_norm_filename, dpi=300, bbox_inches='tight')
         log_dict["weight_norm"] = wandb.Image(weight_norm_filename)
     
     if 'NoiseNorm' in callback_names:
-        noise_norm_p = plot_trace(data["noise_norm/trace"], "noise norm")
-        return_dict[f"{sampler_type}/noise_norm/mean"] = data["noise_norm/trace"].mean().item()
-        noise_norm_p.save(noise_norm_filename, width=10, height=4, dpi=300)
+        noise_norm_p = plot_trace(traces.noise_norm, "noise norm")
+        return_dict[f"{sampler_type}/noise_norm/mean"] = traces.noise_norm.mean().item()
+        noise_norm_p.savefig(noise_norm_filename, dpi=300, bbox_inches='tight')
         log_dict["noise_norm"] = wandb.Image(noise_norm_filename)
     
     if 'GradientNorm' in callback_names:
-        gradient_norm_p = plot_trace(data["gradient_norm/trace"], "gradient norm")
-        return_dict[f"{sampler_type}/gradient_norm/mean"] = data["gradient_norm/trace"].mean().item()
-        gradient_norm_p.save(gradient_norm_filename, width=10, height=4, dpi=300)
+        gradient_norm_p = plot_trace(traces.gradient_norm, "gradient norm")
+        return_dict[f"{sampler_type}/gradient_norm/mean"] = traces.gradient_norm.mean().item()
+        gradient_norm_p.savefig(gradient_norm_filename, dpi=300, bbox_inches='tight')
         log_dict["gradient_norm"] = wandb.Image(gradient_norm_filename)
     
     # TODO: additional metrics to be logged (e.g., GradientDistribution)
@@ -249,4 +337,4 @@ if __name__ == "__main__":
     component_1 = np.random.randn(100)
     component_2 = np.random.randn(100)
     
-    plot_pca_plotly(component_0, component_1, component_2, "test.png")
\ No newline at end of file
+    plot_pca(component_0, component_1, component_2, "test.png")
\ No newline at end of file
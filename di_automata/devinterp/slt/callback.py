@@ -11,6 +11,9 @@ class SamplerCallback:
     and sample() is a helper function that allows access to whatever relevant parameters the callback has computed. 
     For legibility, ach callback can also access parameters in locals() when a class function is called.
     
+    Callbacks built by create_callbacks are cached and reused across sampling runs: reset() zeroes their state in place
+    before each run, so sample() must return copies rather than views of the callback's tensors.
+    
     Parameters:
         device (Union[torch.device, str]): Device to perform computations on, e.g., 'cpu' or 'cuda'.
 
@@ -37,6 +40,9 @@ class SamplerCallback:
     def __call__(self, *args, **kwargs):
         raise NotImplementedError
     
+    def reset(self):
+        raise NotImplementedError
+    
 
 def validate_callbacks(callbacks: List[Callable]):
     for i, callback in enumerate(callbacks):
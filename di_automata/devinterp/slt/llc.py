@@ -48,13 +48,21 @@ class LLCEstimator(SamplerCallback):
         self.llc_per_chain = (self.n / self.n.log()) * (avg_losses - self.init_loss)
         self.llc_mean = self.llc_per_chain.mean()
         self.llc_std = self.llc_per_chain.std()
+
+    def reset(self):
+        self.losses.zero_()
+        self.llc_per_chain.zero_()
+        self.llc_mean.zero_()
+        self.llc_std.zero_()
+        self.acceptance_ratio = 0
+        self.mh_count = 0
         
     def sample(self):
         return {
             "llc/mean": self.llc_mean.cpu().numpy().item(),
             "llc/std": self.llc_std.cpu().numpy().item(),
             **{f"llc-chain/{i}": self.llc_per_chain[i].cpu().numpy().item() for i in range(self.num_chains)},
-            "loss/trace": self.losses.cpu().numpy(),
+            "loss/trace": self.losses.to("cpu", copy=True).numpy(),
             "accept_ratio/mean": self.acceptance_ratio / self.mh_count if self.mh_count > 0 else None,
         }
     
@@ -112,12 +120,18 @@ class OnlineLLCEstimator(SamplerCallback):
         self.llc_means = self.llcs.mean(dim=0)
         self.llc_stds = self.llcs.std(dim=0)
 
+    def reset(self):
+        self.losses.zero_()
+        self.llcs.zero_()
+        self.llc_means.zero_()
+        self.llc_stds.zero_()
+
     def sample(self):
         return {
-            "llc/means": self.llc_means.cpu().numpy(),
-            "llc/stds": self.llc_stds.cpu().numpy(),
-            "llc/trace": self.llcs.cpu().numpy(),
-            "loss/trace": self.losses.cpu().numpy()
+            "llc/means": self.llc_means.to("cpu", copy=True).numpy(),
+            "llc/stds": self.llc_stds.to("cpu", copy=True).numpy(),
+            "llc/trace": self.llcs.to("cpu", copy=True).numpy(),
+            "loss/trace": self.losses.to("cpu", copy=True).numpy()
         }
     
     def __call__(self, chain: int, draw: int, loss: float):
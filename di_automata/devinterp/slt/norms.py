@@ -7,6 +7,13 @@ from di_automata.devinterp.optim.sgld import SGLD
 from di_automata.devinterp.slt.callback import SamplerCallback
 
 
+@torch.no_grad()
+def _total_norm(tensors, p_norm: int) -> torch.Tensor:
+    """(sum_i ||t_i||_2^2)^(1/p_norm), with all per-tensor norms computed before a single reduction."""
+    norms = torch.stack([torch.linalg.vector_norm(t, ord=2) for t in tensors])
+    return norms.square().sum().pow(1 / p_norm)
+
+
 class WeightNorm(SamplerCallback):
     """
     Callback for computing the norm of the weights over the sampling process.
@@ -28,15 +35,14 @@ class WeightNorm(SamplerCallback):
         self.update(chain, draw, model)
     
     def update(self, chain: int, draw: int, model: nn.Module):
-        total_norm = torch.tensor(0.).to(self.device)
-        for param in model.parameters():
-            total_norm += torch.square(torch.linalg.vector_norm(param, ord=2)).to(self.device)
-        total_norm = torch.pow(total_norm, 1/self.p_norm)
-        self.weight_norms[chain, draw] = total_norm
+        self.weight_norms[chain, draw] = _total_norm(model.parameters(), self.p_norm)
+
+    def reset(self):
+        self.weight_norms.zero_()
 
     def sample(self):
         return {
-            "weight_norm/trace": self.weight_norms.cpu().numpy(),
+            "weight_norm/trace": self.weight_norms.to("cpu", copy=True).numpy(),
         }
 
 
@@ -61,15 +67,14 @@ class GradientNorm(SamplerCallback):
         self.update(chain, draw, model)
     
     def update(self, chain: int, draw: int, model: nn.Module):
-        total_norm = torch.tensor(0.).to(self.device)
-        for param in model.parameters():
-            total_norm += torch.square(torch.linalg.vector_norm(param.grad, ord=2)).to(self.device)
-        total_norm = torch.pow(total_norm, 1/self.p_norm)
-        self.gradient_norms[chain, draw] = total_norm
+        self.gradient_norms[chain, draw] = _total_norm((param.grad for param in model.parameters()), self.p_norm)
+
+    def reset(self):
+        self.gradient_norms.zero_()
 
     def sample(self):
         return {
-            "gradient_norm/trace": self.gradient_norms.cpu().numpy(),
+            "gradient_norm/trace": self.gradient_norms.to("cpu", copy=True).numpy(),
         }
     
 
@@ -94,13 +99,12 @@ class NoiseNorm(SamplerCallback):
         self.update(chain, draw, optimizer)
     
     def update(self, chain: int, draw: int, optimizer: SGLD):
-        total_norm = torch.tensor(0.).to(self.device)
-        for noise in optimizer.noise:
-            total_norm += torch.square(torch.linalg.vector_norm(noise, ord=2)).to(self.device)
-        total_norm = torch.pow(total_norm, 1/self.p_norm)
-        self.noise_norms[chain, draw] = total_norm
+        self.noise_norms[chain, draw] = _total_norm(optimizer.noise, self.p_norm)
+
+    def reset(self):
+        self.noise_norms.zero_()
 
     def sample(self):
         return {
-            "noise_norm/trace": self.noise_norms.cpu().numpy(),
+            "noise_norm/trace": self.noise_norms.to("cpu", copy=True).numpy(),
         }
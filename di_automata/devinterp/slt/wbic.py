@@ -36,13 +36,19 @@ class OnlineWBICEstimator(SamplerCallback):
     def finalize(self):
         self.wbic_means = self.wbics.mean(axis=0)
         self.wbic_stds = self.wbics.std(axis=0)
+
+    def reset(self):
+        self.losses.zero_()
+        self.wbics.zero_()
+        self.wbic_means.zero_()
+        self.wbic_stds.zero_()
     
     def sample(self):
         return {
-            'wbic/means': self.wbic_means.cpu().numpy(),
-            'wbic/stds': self.wbic_stds.cpu().numpy(),
-            'wbic/trace': self.wbics.cpu().numpy(),
-            'loss/trace': self.losses.cpu().numpy(),
+            'wbic/means': self.wbic_means.to("cpu", copy=True).numpy(),
+            'wbic/stds': self.wbic_stds.to("cpu", copy=True).numpy(),
+            'wbic/trace': self.wbics.to("cpu", copy=True).numpy(),
+            'loss/trace': self.losses.to("cpu", copy=True).numpy(),
         }
     
     def __call__(self, chain: int, draw: int, loss: float):
@@ -25,7 +25,7 @@ from torch.utils.data import DataLoader
 from di_automata.devinterp.slt.sampler import estimate_learning_coeff_with_summary
 from di_automata.devinterp.rlct_utils import (
     extract_and_save_rlct_data,
-    plot_pca_plotly,
+    plot_pca,
     plot_explained_var,
 )
 from di_automata.config_setup import *
@@ -338,11 +338,14 @@ class PostRunSLT:
             pca_projected_samples[i] = projected_vector
         explained_variance = pca.explained_variance_ratio_
         
-        plot_pca_plotly(pca_projected_samples[:,0], pca_projected_samples[:,1], pca_projected_samples[:,2], self.config)
+        # One pass to contiguous float32 rows instead of three strided column slices
+        component_0, component_1, component_2 = np.ascontiguousarray(pca_projected_samples.T, dtype=np.float32)
+        pca_plot = plot_pca(component_0, component_1, component_2, self.config)
         plot_explained_var(explained_variance)
 
         torch.save(pca_projected_samples, self.ed_folder_path / "pca_projected_samples")
         torch.save(pca, self.ed_folder_path / "pca")
+        pca_plot.result()
 
         wandb.log({
             "ED_PCA_truncated": wandb.Image("PCA.png"),
@@ -1,3 +1,3 @@
 from setuptools import setup, find_packages
 
-setup(name="di_automata", version="0.0.1", packages=find_packages())
\ No newline at end of file
+setup(name="di_automata", version="0.0.1", packages=find_packages(), python_requires=">=3.11")
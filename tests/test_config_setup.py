@@ -0,0 +1,131 @@
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+import yaml
+from omegaconf import OmegaConf
+
+from di_automata import config_setup
+from di_automata.config_msgspec import load_main_config_struct, to_main_config
+from di_automata.config_setup import MainConfig, PermutationResetAutomatonConfig, _num_samples, _to_hashable
+
+
+CONFIG_DIR = Path(__file__).resolve().parents[1] / "scripts" / "configs"
+TASK_CONFIGS = sorted((CONFIG_DIR / "task_config").glob("*.yaml"))
+
+
+def _hydra_config(task_config_path: Path):
+    """Mimic what Hydra hands to scripts/run.py: main_config with the task_config default composed in."""
+    config = OmegaConf.load(CONFIG_DIR / "main_config.yaml")
+    config.pop("defaults")
+    config.task_config = OmegaConf.load(task_config_path)
+    OmegaConf.resolve(config)
+    OmegaConf.set_struct(config, False)
+    return config
+
+
+@pytest.mark.parametrize("task_config_path", TASK_CONFIGS, ids=lambda p: p.stem)
+def test_main_config_from_dictconfig(task_config_path):
+    """MainConfig(**config) with a DictConfig, as in scripts/run.py, matches building it from plain containers."""
+    config = _hydra_config(task_config_path)
+    from_dictconfig = MainConfig(**config)
+    from_container = MainConfig(**OmegaConf.to_container(_hydra_config(task_config_path)))
+    assert from_dictconfig.model_dump() == from_container.model_dump()
+    # run.py converts straight back to OmegaConf for the rest of the pipeline
+    OmegaConf.create(from_dictconfig.model_dump())
+
+
+def test_to_hashable_dictconfig():
+    """Task config cache keys are the same whether the task config arrives as a DictConfig or a dict."""
+    task_config = {"dataset_type": "permutation_reset", "generators": [[1, 0, 2], [0, 2, 1]], "label_type": "state"}
+    key = _to_hashable(OmegaConf.create(task_config))
+    hash(key)
+    assert key == _to_hashable(task_config)
+
+
+def test_permutation_reset_config_is_comparable_and_serialisable():
+    config = PermutationResetAutomatonConfig(n=5)
+    assert config == PermutationResetAutomatonConfig(n=5)
+    config.model_dump_json()
+
+
+def test_msgspec_struct_defers_defaults_to_main_config(tmp_path):
+    """Keys missing from the YAML (here rlct_config.seed) get MainConfig's defaults, not struct-level ones."""
+    config = OmegaConf.to_container(_hydra_config(TASK_CONFIGS[0]))
+    del config["rlct_config"]["seed"]
+    path = tmp_path / "config.yaml"
+    path.write_text(yaml.safe_dump(config))
+    from_struct = to_main_config(load_main_config_struct(path))
+    assert from_struct.model_dump() == MainConfig(**yaml.safe_load(path.read_text())).model_dump()
+
+
+@pytest.fixture
+def cached_config_loader(tmp_path, monkeypatch):
+    """load_main_config with the cache under tmp_path, and a count of how many times it parsed the YAML (cache misses)."""
+    monkeypatch.setattr(config_setup, "CONFIG_CACHE_DIR", tmp_path / "cache")
+    builds = []
+
+    def counting_safe_load(text):
+        builds.append(text)
+        return yaml.safe_load(text)
+
+    monkeypatch.setattr(config_setup, "yaml", SimpleNamespace(safe_load=counting_safe_load))
+    path = tmp_path / "config.yaml"
+    path.write_text(yaml.safe_dump(OmegaConf.to_container(_hydra_config(TASK_CONFIGS[0]))))
+    return lambda: config_setup.load_main_config(path), builds
+
+
+def test_load_main_config_hits_cache(cached_config_loader):
+    load, builds = cached_config_loader
+    first = load()
+    assert load() == first
+    assert len(builds) == 1
+
+
+def test_load_main_config_misses_cache_on_new_salt(cached_config_loader, monkeypatch):
+    load, builds = cached_config_loader
+    load()
+    monkeypatch.setattr(config_setup, "_config_cache_salt", lambda: b"edited config_setup.py")
+    load()
+    assert len(builds) == 2
+
+
+@pytest.mark.parametrize("contents", [b"", b"not a pickle", b"\x80\x04\x95"], ids=["empty", "garbage", "truncated"])
+def test_load_main_config_rebuilds_corrupt_cache(cached_config_loader, contents):
+    load, builds = cached_config_loader
+    first = load()
+    (cache_file,) = config_setup.CONFIG_CACHE_DIR.glob("config-*.pkl")
+    cache_file.write_bytes(contents)
+    assert load() == first
+    assert len(builds) == 2
+    # The rebuilt config replaced the corrupt file
+    assert load() == first
+    assert len(builds) == 2
+
+
+def test_lazy_task_configs_are_importable_by_name():
+    from di_automata.config_setup import DihedralAutomatonConfig, PermutationResetAutomatonConfig, QuaternionAutomatonConfig
+
+    assert {"DihedralAutomatonConfig", "QuaternionAutomatonConfig", "PermutationResetAutomatonConfig"} <= set(dir(config_setup))
+    assert config_setup.config_class_map["dihedral"] is DihedralAutomatonConfig
+
+
+@pytest.mark.parametrize(
+    "samples_drawn, vocab_size, length",
+    [
+        (320000, 2, 10),  # gridworld: dataset (1024) smaller than samples drawn
+        (1024, 2, 10),  # samples_drawn == vocab_size ** length
+        (1023, 2, 10),
+        (1025, 2, 10),
+        (5**25, 5, 25),  # boundary where float logs can no longer tell the two apart
+        (5**25 - 1, 5, 25),
+        (5**25 + 1, 5, 25),
+        (3**31 + 1, 3, 31),  # float logs put this below 3 ** 31 without the margin
+        (320000, 5, 25),
+        (320000, 1, 25),  # vocab_size == 1: a single possible sequence
+        (1, 1, 25),
+        (0, 5, 25),
+    ],
+)
+def test_num_samples_matches_exact_min(samples_drawn, vocab_size, length):
+    assert _num_samples(samples_drawn, vocab_size, length) == min(samples_drawn, vocab_size**length)
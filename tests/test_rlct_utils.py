@@ -0,0 +1,61 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+torch = pytest.importorskip("torch")
+pytest.importorskip("wandb")
+
+# Import order as in train_utils: rlct_utils and slt.sampler import each other, and only resolve starting from slt
+import di_automata.devinterp.slt  # noqa: F401
+from di_automata.devinterp.rlct_utils import create_callbacks
+
+
+def _sampling_config(online: bool = False):
+    rlct_config = SimpleNamespace(num_chains=2, num_draws=3, num_samples=100, online=online, use_diagnostics=True)
+    return SimpleNamespace(rlct_config=rlct_config)
+
+
+@pytest.mark.parametrize("online", [False, True], ids=["llc", "online_llc"])
+def test_results_survive_callback_reuse(online):
+    """Results from one run stay intact when the next create_callbacks call reuses and reset()s the same callbacks."""
+    config = _sampling_config(online)
+    callbacks, _ = create_callbacks(config, "cpu")
+    llc_estimator, wbic_estimator, *norms = callbacks
+    for chain in range(2):
+        for draw in range(3):
+            loss = float(1 + chain + draw)
+            if online:
+                llc_estimator(chain, draw, loss)
+            else:
+                llc_estimator(chain, draw, loss, acceptance_ratio=1.0)
+            wbic_estimator(chain, draw, loss)
+    # Norm callbacks need a model/optimizer to update, so fill their traces directly
+    for norm in norms:
+        for tensor in vars(norm).values():
+            if isinstance(tensor, torch.Tensor):
+                tensor.fill_(1.0)
+    results = {}
+    for callback in callbacks:
+        if hasattr(callback, "finalize"):
+            callback.finalize()
+        results.update(callback.sample())
+    expected = {key: value.copy() for key, value in results.items() if isinstance(value, np.ndarray)}
+
+    reused, _ = create_callbacks(config, "cpu")
+
+    assert all(new is old for new, old in zip(reused, callbacks))
+    assert not llc_estimator.losses.any()
+    for key, value in expected.items():
+        np.testing.assert_array_equal(results[key], value, err_msg=key)
+
+
+def test_callback_results_reuse_sample_arrays():
+    """CallbackResults wraps the already-copied float32 arrays from sample() without a second copy."""
+    from di_automata.devinterp.rlct_utils import CallbackResults
+
+    loss_trace = np.arange(6, dtype=np.float32).reshape(2, 3)
+    results = CallbackResults.from_sample({"loss/trace": loss_trace, "llc/mean": 0.0})
+    assert results.loss is loss_trace
+    assert results.weight_norm is None
+    assert results.to_dataframe().shape == (6, 3)